@@ -1,43 +1,118 @@
 """
 Module: data_manager
 Handles loading and saving data stored in a JSON file.
+If DATA_FILE ends with '.gz', the JSON is stored gzip-compressed.
 """
 
-import json
+import gzip
 import os
+from datetime import datetime
+from functools import lru_cache
+
+try:
+    import orjson as _json
+    _FAST_JSON = True
+except ImportError:
+    import json as _json
+    _FAST_JSON = False
 
 DATA_FILE = "sober_data.json"
 
+@lru_cache(maxsize=None)
+def parse_date(date_str: str) -> datetime:
+    """
+    Parses a log date in 'YYYY-MM-DD' format. Results are cached, since the
+    same log keys are parsed again by every statistics and report pass.
+
+    Parameters:
+        date_str (str): The date string to parse.
+
+    Returns:
+        datetime: The parsed date.
+    """
+    return datetime.strptime(date_str, "%Y-%m-%d")
+
+def _dumps(data: dict) -> bytes:
+    """
+    Serializes data to UTF-8 encoded JSON bytes, using orjson when available.
+    """
+    if _FAST_JSON:
+        return _json.dumps(data, option=_json.OPT_INDENT_2 | _json.OPT_NON_STR_KEYS)
+    return _json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+
 def load_data() -> dict:
     """
     Loads data from the JSON file. If the file does not exist,
-    returns a default data structure.
+    returns a default data structure. The daily log is returned in
+    date order with zero-padded 'YYYY-MM-DD' keys, and every entry has
+    a boolean 'sober' flag and a float 'amount_spent'.
 
     Returns:
         dict: Data loaded from file.
     """
     try:
         if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(DATA_FILE, "rb") as f:
+                buf = f.read()
+            if DATA_FILE.endswith(".gz"):
+                buf = gzip.decompress(buf)
+            data = _json.loads(buf)
         else:
             data = {}
     except Exception as e:
         print(f"Error loading data: {e}")
         data = {}
     data.setdefault("daily_drink_cost", 0.0)  # Set manually if needed
-    data.setdefault("daily_log", {})
+    # Older files may hold dates exactly as typed (e.g. '2024-1-5'); store them
+    # zero-padded so the month and year can be read by slicing the key
+    raw_log = data.get("daily_log", {})
+    daily_log = {}
+    for date_str, record in raw_log.items():
+        try:
+            key = parse_date(date_str).strftime("%Y-%m-%d")
+        except ValueError:
+            key = date_str
+        # An entry already stored under the zero-padded date takes precedence
+        if key != date_str and key in raw_log:
+            continue
+        daily_log[key] = record
+    data["daily_log"] = dict(sorted(daily_log.items()))
+    # Fill in the sober flag and store amounts as floats once here,
+    # so readers can index records directly
+    for record in data["daily_log"].values():
+        record["sober"] = bool(record.get("sober", False))
+        try:
+            record["amount_spent"] = float(record.get("amount_spent") or 0.0)
+        except (TypeError, ValueError):
+            record["amount_spent"] = 0.0
     return data
 
-def save_data(data: dict) -> None:
+def save_data(data: dict) -> bool:
     """
     Saves the provided data dictionary to the JSON file.
 
     Parameters:
         data (dict): The data to save.
+
+    Returns:
+        bool: True if the data was written, False if saving failed.
     """
+    tmp_file = DATA_FILE + ".tmp"
     try:
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        payload = _dumps(data)
+        if DATA_FILE.endswith(".gz"):
+            # The lowest level already shrinks the repetitive entries many times over
+            payload = gzip.compress(payload, compresslevel=1)
+        # Write to a temporary file and swap it in, so an interrupted save
+        # never leaves a truncated data file behind.
+        with open(tmp_file, "wb", buffering=1024 * 1024) as f:
+            f.write(payload)
+        os.replace(tmp_file, DATA_FILE)
     except Exception as e:
         print(f"Error saving data: {e}")
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        return False
+    return True
@@ -3,12 +3,130 @@ Module: report
 Contains the ExcelReport class for exporting the log and summary to an Excel file.
 """
 
+import re
+import zipfile
+from xml.sax.saxutils import escape
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill, Font, Border, Side, Alignment
+from openpyxl.utils import get_column_letter
 from .data_manager import load_data
-from datetime import datetime
+from .tracker import compute_stats
 from .constants import MONTH_NAMES, DEFAULT_AMOUNT
 
+# openpyxl styles are immutable, so one instance of each is shared by every cell using it
+GREEN_FILL = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+RED_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+HEADER_FONT = Font(bold=True, size=14)
+HEADER_FILL = PatternFill(start_color="BDD7EE", end_color="BDD7EE", fill_type="solid")
+HEADER_ALIGN = Alignment(horizontal="center", wrap_text=True)
+LABEL_FONT = Font(bold=True)
+DATA_ALIGN = Alignment(horizontal="left", wrap_text=True)
+THIN_BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin")
+)
+
+COLUMNS = ["Date", "Status", "Mood", "Type of Alcohol", "Amount Consumed", "Notes", "Amount Spent"]
+
+# Logs with at least this many entries are written as raw XLSX XML, skipping openpyxl cells
+_FAST_WRITE_MIN_ROWS = 2000
+
+# Characters that are not allowed in XML 1.0 documents
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Static parts of the package written by ExcelReport._generate_fast
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Sobriety Report" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+# Pre-baked cell formats matching the style constants above, referenced by the s attribute:
+# 1 = green fill, 2 = red fill, 3 = summary header, 4 = summary label, 5 = summary value
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="3">'
+    '<font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/></font>'
+    '<font><b/><sz val="14"/></font>'
+    '</fonts>'
+    '<fills count="5">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00C6EFCE"/><bgColor rgb="00C6EFCE"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00FFC7CE"/><bgColor rgb="00FFC7CE"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00BDD7EE"/><bgColor rgb="00BDD7EE"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="2">'
+    '<border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="6">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="0" fillId="2" borderId="0" xfId="0" applyFill="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="3" borderId="0" xfId="0" applyFill="1"/>'
+    '<xf numFmtId="0" fontId="2" fillId="4" borderId="1" xfId="0" applyFont="1" applyFill="1" '
+    'applyBorder="1" applyAlignment="1"><alignment horizontal="center" wrapText="1"/></xf>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1" '
+    'applyAlignment="1"><alignment horizontal="left" wrapText="1"/></xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+def _row_cells(ws, row: list, summary_cells=()):
+    """
+    Lazily yields the cells of one report row for a write-only worksheet,
+    wrapping the status value in a filled cell and appending any summary cells.
+    """
+    for i, value in enumerate(row):
+        if i == 1 and value is not None:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.fill = GREEN_FILL if value == "Sober" else RED_FILL
+            yield cell
+        else:
+            yield value
+    yield from summary_cells
+
 class ExcelReport:
     """
     A class to generate an Excel report from the sobriety log.
@@ -19,149 +137,158 @@ class ExcelReport:
     def generate(self, filename: str) -> None:
         """
         Generates and saves an Excel report with log entries and a summary.
+        Large logs are written directly as XLSX XML instead of through openpyxl.
 
         Parameters:
             filename (str): The name of the Excel file to create.
         """
         try:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Sobriety Report"
-            ws.append(["Date", "Status", "Mood", "Type of Alcohol", "Amount Consumed", "Notes", "Amount Spent"])
+            # Column widths are tracked while the rows are being built, since
+            # both writers need them before the first row is written.
+            widths = [len(title) for title in COLUMNS]
+            rows = []
 
             daily_log = self.data.get("daily_log", {})
-            for date_str in sorted(daily_log.keys()):
-                entry = daily_log[date_str]
-                status_text = "Sober" if entry.get("sober", False) else "Drinking"
-                if entry.get("sober", False):
+            for date_str, entry in daily_log.items():
+                sober = entry["sober"]
+                if sober:
                     amount_spent_str = ""
                 else:
-                    try:
-                        amount_spent = float(entry.get("amount_spent", DEFAULT_AMOUNT))
-                        if amount_spent == 0:
-                            amount_spent = DEFAULT_AMOUNT
-                    except Exception:
-                        amount_spent = DEFAULT_AMOUNT
+                    amount_spent = entry["amount_spent"] or DEFAULT_AMOUNT
                     amount_spent_str = f"{amount_spent:.2f} $"
-                ws.append([
+                row = [
                     date_str,
-                    status_text,
+                    "Sober" if sober else "Drinking",
                     entry.get("mood", ""),
                     entry.get("alcohol_type", ""),
                     entry.get("alcohol_amount", ""),
                     entry.get("notes", ""),
                     amount_spent_str
-                ])
-
-            for column_cells in ws.columns:
-                max_length = max(len(str(cell.value)) for cell in column_cells if cell.value is not None)
-                ws.column_dimensions[column_cells[0].column_letter].width = max_length + 2
-
-            # Format status column
-            light_green = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-            light_red = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-            for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=2, max_col=2):
-                for cell in row:
-                    if cell.value == "Sober":
-                        cell.fill = light_green
-                    elif cell.value == "Drinking":
-                        cell.fill = light_red
+                ]
+                for i, value in enumerate(row):
+                    # Cells are almost always strings, so skip str() for them
+                    if isinstance(value, str):
+                        length = len(value)
+                    else:
+                        length = len(str(value)) if value is not None else 0
+                    if length > widths[i]:
+                        widths[i] = length
+                rows.append(row)
 
             # Summary calculations
-            total_days = len(daily_log)
-            sober_days = sum(1 for record in daily_log.values() if record.get("sober", False))
-            drinking_days = total_days - sober_days
-            percent_sober = (sober_days / total_days * 100) if total_days > 0 else 0
-
-            sorted_dates = sorted(daily_log.keys())
-            longest_streak = 0
-            current_streak = 0
-            previous_date = None
-            for date_str in sorted_dates:
-                try:
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                except Exception:
-                    continue
-                if daily_log[date_str].get("sober", False):
-                    if previous_date and (date_obj - previous_date).days == 1:
-                        current_streak += 1
-                    else:
-                        current_streak = 1
-                    longest_streak = max(longest_streak, current_streak)
-                else:
-                    current_streak = 0
-                previous_date = date_obj
+            stats = compute_stats(daily_log)
+            summary = [
+                ("Total days in log:", stats.total_days),
+                ("Sober days:", stats.sober_days),
+                ("Drinking days:", stats.drinking_days),
+                ("Percentage sober:", f"{stats.percent_sober:.2f}%"),
+                ("Longest sober streak:", f"{stats.longest_streak} days"),
+                ("Current sober streak:", f"{stats.current_streak} days"),
+                ("Total amount spent (overall):", f"{stats.overall_spent:.2f} $"),
+            ]
 
-            current_seq = 0
-            for date_str in reversed(sorted_dates):
-                if daily_log[date_str].get("sober", False):
-                    current_seq += 1
-                else:
-                    break
-
-            overall_spending = sum(
-                float(record.get("amount_spent", DEFAULT_AMOUNT))
-                if (not record.get("sober", True)) and float(record.get("amount_spent", DEFAULT_AMOUNT)) > 0
-                else DEFAULT_AMOUNT
-                for record in daily_log.values() if not record.get("sober", False)
-            )
-
-            summary_start_col = 8  # Column H
-            summary_start_row = 2
-
-            ws.merge_cells(start_row=summary_start_row, start_column=summary_start_col,
-                           end_row=summary_start_row, end_column=summary_start_col+1)
-            header_cell = ws.cell(row=summary_start_row, column=summary_start_col)
-            header_cell.value = "Summary"
-            header_cell.font = Font(bold=True, size=14)
-            header_cell.alignment = Alignment(horizontal="center", wrap_text=True)
-            header_cell.fill = PatternFill(start_color="BDD7EE", end_color="BDD7EE", fill_type="solid")
-
-            label_font = Font(bold=True)
-            data_alignment = Alignment(horizontal="left", wrap_text=True)
-
-            ws.cell(row=summary_start_row+1, column=summary_start_col, value="Total days in log:").font = label_font
-            ws.cell(row=summary_start_row+1, column=summary_start_col).alignment = data_alignment
-            ws.cell(row=summary_start_row+1, column=summary_start_col+1, value=total_days)
-
-            ws.cell(row=summary_start_row+2, column=summary_start_col, value="Sober days:").font = label_font
-            ws.cell(row=summary_start_row+2, column=summary_start_col).alignment = data_alignment
-            ws.cell(row=summary_start_row+2, column=summary_start_col+1, value=sober_days)
-
-            ws.cell(row=summary_start_row+3, column=summary_start_col, value="Drinking days:").font = label_font
-            ws.cell(row=summary_start_row+3, column=summary_start_col).alignment = data_alignment
-            ws.cell(row=summary_start_row+3, column=summary_start_col+1, value=drinking_days)
-
-            ws.cell(row=summary_start_row+4, column=summary_start_col, value="Percentage sober:").font = label_font
-            ws.cell(row=summary_start_row+4, column=summary_start_col).alignment = data_alignment
-            ws.cell(row=summary_start_row+4, column=summary_start_col+1, value=f"{percent_sober:.2f}%")
-
-            ws.cell(row=summary_start_row+5, column=summary_start_col, value="Longest sober streak:").font = label_font
-            ws.cell(row=summary_start_row+5, column=summary_start_col).alignment = data_alignment
-            ws.cell(row=summary_start_row+5, column=summary_start_col+1, value=f"{longest_streak} days")
-
-            ws.cell(row=summary_start_row+6, column=summary_start_col, value="Current sober streak:").font = label_font
-            ws.cell(row=summary_start_row+6, column=summary_start_col).alignment = data_alignment
-            ws.cell(row=summary_start_row+6, column=summary_start_col+1, value=f"{current_seq} days")
-
-            ws.cell(row=summary_start_row+7, column=summary_start_col, value="Total amount spent (overall):").font = label_font
-            ws.cell(row=summary_start_row+7, column=summary_start_col).alignment = data_alignment
-            ws.cell(row=summary_start_row+7, column=summary_start_col+1, value=f"{overall_spending:.2f} $")
-
-            thin_border = Border(
-                left=Side(style="thin"),
-                right=Side(style="thin"),
-                top=Side(style="thin"),
-                bottom=Side(style="thin")
-            )
-            for row in range(summary_start_row, summary_start_row+8):
-                for col in range(summary_start_col, summary_start_col+2):
-                    ws.cell(row=row, column=col).border = thin_border
-
-            ws.column_dimensions['H'].width = 35
-            ws.column_dimensions['I'].width = 25
-
-            wb.save(filename)
+            if len(rows) >= _FAST_WRITE_MIN_ROWS:
+                self._generate_fast(filename, rows, widths, summary)
+            else:
+                self._generate_openpyxl(filename, rows, widths, summary)
             print(f"Report saved to file: {filename}")
         except Exception as e:
             print(f"Error generating report: {e}")
+
+    def _generate_openpyxl(self, filename: str, rows: list, widths: list, summary: list) -> None:
+        """
+        Writes the report through an openpyxl write-only workbook.
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Sobriety Report")
+
+        def label_cell(value: str) -> WriteOnlyCell:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.font = LABEL_FONT
+            cell.alignment = DATA_ALIGN
+            cell.border = THIN_BORDER
+            return cell
+
+        def value_cell(value) -> WriteOnlyCell:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.border = THIN_BORDER
+            return cell
+
+        summary_header = WriteOnlyCell(ws, value="Summary")
+        summary_header.font = HEADER_FONT
+        summary_header.alignment = HEADER_ALIGN
+        summary_header.fill = HEADER_FILL
+        summary_header.border = THIN_BORDER
+
+        # Summary block occupies columns H:I starting at row 2, next to the log rows
+        summary_rows = [[summary_header, value_cell(None)]]
+        summary_rows.extend([label_cell(label), value_cell(value)] for label, value in summary)
+
+        for i, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(i)].width = width + 2
+        ws.column_dimensions['H'].width = 35
+        ws.column_dimensions['I'].width = 25
+        ws.merged_cells.add("H2:I2")
+
+        ws.append(COLUMNS)
+        empty_row = [None] * len(COLUMNS)
+        for i in range(max(len(rows), len(summary_rows))):
+            row = rows[i] if i < len(rows) else empty_row
+            ws.append(_row_cells(ws, row, summary_rows[i] if i < len(summary_rows) else ()))
+
+        wb.save(filename)
+
+    def _generate_fast(self, filename: str, rows: list, widths: list, summary: list) -> None:
+        """
+        Writes the report by streaming the worksheet XML straight into the
+        XLSX zip package, with no per-cell objects or runtime style tables.
+        """
+        def cell_xml(ref: str, value, style: int = 0) -> str:
+            style_attr = f' s="{style}"' if style else ""
+            if value is None or value == "":
+                return f'<c r="{ref}"{style_attr}/>' if style else ""
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return f'<c r="{ref}"{style_attr}><v>{value}</v></c>'
+            text = escape(_ILLEGAL_XML_CHARS.sub("", str(value)))
+            return f'<c r="{ref}"{style_attr} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+        letters = [get_column_letter(i) for i in range(1, len(COLUMNS) + 3)]
+        col_widths = [width + 2 for width in widths] + [35, 25]
+        summary_cells = [(("Summary", 3), (None, 5))]
+        summary_cells.extend(((label, 4), (value, 5)) for label, value in summary)
+
+        with zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("[Content_Types].xml", _CONTENT_TYPES_XML)
+            zf.writestr("_rels/.rels", _ROOT_RELS_XML)
+            zf.writestr("xl/workbook.xml", _WORKBOOK_XML)
+            zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS_XML)
+            zf.writestr("xl/styles.xml", _STYLES_XML)
+            with zf.open("xl/worksheets/sheet1.xml", "w") as sheet:
+                cols = "".join(
+                    f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>'
+                    for i, width in enumerate(col_widths, start=1)
+                )
+                sheet.write((
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    f'<cols>{cols}</cols><sheetData>'
+                ).encode("utf-8"))
+
+                header = "".join(cell_xml(f"{letters[i]}1", title) for i, title in enumerate(COLUMNS))
+                sheet.write(f'<row r="1">{header}</row>'.encode("utf-8"))
+                for i in range(max(len(rows), len(summary_cells))):
+                    r = i + 2
+                    parts = []
+                    if i < len(rows):
+                        row = rows[i]
+                        for j, value in enumerate(row):
+                            style = (1 if value == "Sober" else 2) if j == 1 else 0
+                            parts.append(cell_xml(f"{letters[j]}{r}", value, style))
+                    if i < len(summary_cells):
+                        for j, (value, style) in enumerate(summary_cells[i], start=len(COLUMNS)):
+                            parts.append(cell_xml(f"{letters[j]}{r}", value, style))
+                    sheet.write(f'<row r="{r}">{"".join(parts)}</row>'.encode("utf-8"))
+
+                sheet.write(
+                    b'</sheetData><mergeCells count="1"><mergeCell ref="H2:I2"/></mergeCells></worksheet>'
+                )
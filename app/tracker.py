@@ -3,16 +3,168 @@ Module: tracker
 Contains the SobrietyTracker class for managing log entries and computing statistics.
 """
 
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from .data_manager import load_data, save_data
+from .data_manager import load_data, save_data, parse_date
 from .constants import DEFAULT_AMOUNT, MONTH_NAMES
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many entries the plain Python loop is faster than building arrays
+_NUMPY_MIN_ENTRIES = 1000
+
+@dataclass
+class Stats:
+    """
+    Statistics computed from the daily log in a single pass.
+    """
+    monthly: dict = field(default_factory=dict)
+    yearly: dict = field(default_factory=dict)
+    total_days: int = 0
+    sober_days: int = 0
+    longest_streak: int = 0
+    current_streak: int = 0
+    overall_spent: float = 0.0
+    current_month_spent: float = 0.0
+
+    @property
+    def drinking_days(self) -> int:
+        return self.total_days - self.sober_days
+
+    @property
+    def percent_sober(self) -> float:
+        return (self.sober_days / self.total_days * 100) if self.total_days else 0
+
+def compute_stats(daily_log: dict) -> Stats:
+    """
+    Computes monthly, yearly, streak and spending statistics with a single
+    traversal of the log. Large logs are aggregated with NumPy when it is
+    installed. A zero 'amount_spent' on a drinking day counts as DEFAULT_AMOUNT.
+
+    Parameters:
+        daily_log (dict): Log entries keyed by 'YYYY-MM-DD' date, in date order
+            (as returned by load_data).
+
+    Returns:
+        Stats: The computed statistics.
+    """
+    if np is not None and len(daily_log) >= _NUMPY_MIN_ENTRIES:
+        try:
+            return _compute_stats_numpy(daily_log)
+        except ValueError:
+            # Dates not in strict 'YYYY-MM-DD' form, use the plain loop
+            pass
+    return _compute_stats_python(daily_log)
+
+def _compute_stats_python(daily_log: dict) -> Stats:
+    """
+    Computes statistics for compute_stats with a plain Python loop.
+    """
+    stats = Stats()
+    monthly = defaultdict(lambda: {"sober_days": 0, "total_days": 0, "spent": 0.0})
+    yearly = defaultdict(lambda: {"sober_days": 0, "total_days": 0})
+    now = datetime.now()
+    streak = 0
+    previous_date = None
+    for date_str, record in daily_log.items():
+        sober = record["sober"]
+        stats.total_days += 1
+        if sober:
+            stats.sober_days += 1
+        try:
+            date_obj = parse_date(date_str)
+        except Exception:
+            continue
+        m_stat = monthly[date_str[:7]]
+        y_stat = yearly[date_str[:4]]
+        m_stat["total_days"] += 1
+        y_stat["total_days"] += 1
+        if sober:
+            m_stat["sober_days"] += 1
+            y_stat["sober_days"] += 1
+            if previous_date and (date_obj - previous_date).days == 1:
+                streak += 1
+            else:
+                streak = 1
+            stats.longest_streak = max(stats.longest_streak, streak)
+        else:
+            streak = 0
+            amt = record["amount_spent"] or DEFAULT_AMOUNT
+            m_stat["spent"] += amt
+            stats.overall_spent += amt
+            if date_obj.year == now.year and date_obj.month == now.month:
+                stats.current_month_spent += amt
+        previous_date = date_obj
+
+    # The streak still running at the end of the log is current if it reaches today or yesterday
+    if previous_date and (now - previous_date).days <= 1:
+        stats.current_streak = streak
+
+    stats.monthly = dict(monthly)
+    stats.yearly = dict(yearly)
+    return stats
+
+def _compute_stats_numpy(daily_log: dict) -> Stats:
+    """
+    Computes statistics for compute_stats with NumPy array operations.
+    Raises ValueError if a date key is not in 'YYYY-MM-DD' form.
+    """
+    count = len(daily_log)
+    dates = np.array(list(daily_log), dtype="datetime64[D]")
+    sober = np.fromiter((record["sober"] for record in daily_log.values()), dtype=bool, count=count)
+    spent = np.fromiter(
+        (0.0 if record["sober"] else record["amount_spent"] or DEFAULT_AMOUNT
+         for record in daily_log.values()),
+        dtype=np.float64, count=count
+    )
+    stats = Stats(total_days=count, sober_days=int(sober.sum()))
+
+    months = dates.astype("datetime64[M]")
+    month_keys, month_idx = np.unique(months, return_inverse=True)
+    month_totals = np.bincount(month_idx, minlength=month_keys.size)
+    month_sober = np.bincount(month_idx, weights=sober, minlength=month_keys.size)
+    month_spent = np.bincount(month_idx, weights=spent, minlength=month_keys.size)
+    stats.monthly = {
+        str(key): {"sober_days": int(month_sober[i]), "total_days": int(month_totals[i]), "spent": float(month_spent[i])}
+        for i, key in enumerate(month_keys)
+    }
+
+    year_keys, year_idx = np.unique(dates.astype("datetime64[Y]"), return_inverse=True)
+    year_totals = np.bincount(year_idx, minlength=year_keys.size)
+    year_sober = np.bincount(year_idx, weights=sober, minlength=year_keys.size)
+    stats.yearly = {
+        str(key): {"sober_days": int(year_sober[i]), "total_days": int(year_totals[i])}
+        for i, key in enumerate(year_keys)
+    }
+
+    # A sober day continues a streak when the previous entry is the day before and also sober
+    continues = np.zeros(count, dtype=bool)
+    continues[1:] = sober[1:] & sober[:-1] & (np.diff(dates.astype("i8")) == 1)
+    run_ids = np.cumsum(sober & ~continues)
+    now = datetime.now()
+    if stats.sober_days:
+        run_lengths = np.bincount(run_ids[sober])
+        stats.longest_streak = int(run_lengths.max())
+        # The streak still running at the end of the log is current if it reaches today or yesterday
+        if sober[-1] and (np.datetime64(now.date()) - dates[-1]).astype(int) <= 1:
+            stats.current_streak = int(run_lengths[run_ids[-1]])
+
+    stats.overall_spent = float(spent.sum())
+    stats.current_month_spent = float(spent[months == np.datetime64(f"{now.year}-{now.month:02d}")].sum())
+    return stats
+
 class SobrietyTracker:
     """
     A class to manage sobriety logs and compute statistics.
     """
     def __init__(self):
         self.data = load_data()
+        self._dirty = False
 
     def log_entry(self, date_str: str, sober: bool, mood: str, notes: str,
                   alcohol_type: str = "", alcohol_amount: str = "", amount_spent: float = 0.0) -> None:
@@ -32,24 +184,39 @@ class SobrietyTracker:
             if not date_str:
                 date_obj = datetime.now()
                 date_str = date_obj.strftime("%Y-%m-%d")
-            # Validate date format
-            datetime.strptime(date_str, "%Y-%m-%d")
+            # Validate date format and store it zero-padded, so the month and
+            # year of an entry can be read by slicing its key
+            date_str = parse_date(date_str).strftime("%Y-%m-%d")
         except Exception as e:
             print(f"Error in date format: {e}")
             return
 
-        self.data["daily_log"][date_str] = {
+        daily_log = self.data["daily_log"]
+        # The log is kept in date order: later dates are simply appended,
+        # back-dated ones require the log to be re-sorted
+        needs_sort = date_str not in daily_log and daily_log and date_str < next(reversed(daily_log))
+        daily_log[date_str] = {
             "sober": sober,
             "mood": mood,
             "notes": notes,
             "alcohol_type": alcohol_type,
             "alcohol_amount": alcohol_amount,
-            "amount_spent": amount_spent
+            "amount_spent": float(amount_spent)
         }
-        try:
-            save_data(self.data)
-        except Exception as e:
-            print(f"Error saving log entry: {e}")
+        if needs_sort:
+            entries = sorted(daily_log.items())
+            daily_log.clear()
+            daily_log.update(entries)
+        self._dirty = True
+
+    def flush(self) -> None:
+        """
+        Saves pending log entries to the data file. Does nothing if there are
+        no unsaved changes, so bulk callers can log many entries and flush once.
+        If saving fails, the changes stay pending and the next flush retries.
+        """
+        if self._dirty and save_data(self.data):
+            self._dirty = False
 
     def get_all_entries(self) -> dict:
         """
@@ -57,6 +224,12 @@ class SobrietyTracker:
         """
         return self.data.get("daily_log", {})
 
+    def _compute_all(self) -> Stats:
+        """
+        Computes all statistics for the current log in a single pass.
+        """
+        return compute_stats(self.get_all_entries())
+
     def get_statistics(self) -> dict:
         """
         Computes and returns monthly and yearly statistics.
@@ -64,35 +237,8 @@ class SobrietyTracker:
         Returns:
             dict: Contains keys 'monthly' and 'yearly' with computed stats.
         """
-        stats = {"monthly": {}, "yearly": {}}
-        daily_log = self.get_all_entries()
-        for date_str, record in daily_log.items():
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            except Exception:
-                continue
-            month_key = date_obj.strftime("%Y-%m")
-            if month_key not in stats["monthly"]:
-                stats["monthly"][month_key] = {"sober_days": 0, "total_days": 0, "spent": 0.0}
-            stats["monthly"][month_key]["total_days"] += 1
-            if record.get("sober", False):
-                stats["monthly"][month_key]["sober_days"] += 1
-            else:
-                try:
-                    amt = float(record.get("amount_spent", DEFAULT_AMOUNT))
-                except Exception:
-                    amt = DEFAULT_AMOUNT
-                if amt == 0:
-                    amt = DEFAULT_AMOUNT
-                stats["monthly"][month_key]["spent"] += amt
-
-            year_key = date_obj.strftime("%Y")
-            if year_key not in stats["yearly"]:
-                stats["yearly"][year_key] = {"sober_days": 0, "total_days": 0}
-            stats["yearly"][year_key]["total_days"] += 1
-            if record.get("sober", False):
-                stats["yearly"][year_key]["sober_days"] += 1
-        return stats
+        stats = self._compute_all()
+        return {"monthly": stats.monthly, "yearly": stats.yearly}
 
     def get_additional_stats(self) -> dict:
         """
@@ -102,54 +248,22 @@ class SobrietyTracker:
         Returns:
             dict: Contains 'total_days', 'percent_sober', 'longest_streak', and 'current_streak'.
         """
-        daily_log = self.get_all_entries()
-        sorted_dates = sorted(daily_log.keys())
-        total_days = len(sorted_dates)
-        sober_days = sum(1 for d in daily_log if daily_log[d].get("sober", False))
-        percent_sober = (sober_days / total_days * 100) if total_days else 0
-
-        longest_streak = 0
-        current_streak = 0
-        previous_date = None
-        for date_str in sorted_dates:
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            except Exception:
-                continue
-            if daily_log[date_str].get("sober", False):
-                if previous_date and (date_obj - previous_date).days == 1:
-                    current_streak += 1
-                else:
-                    current_streak = 1
-                longest_streak = max(longest_streak, current_streak)
-            else:
-                current_streak = 0
-            previous_date = date_obj
-
-        # Calculate current streak from latest entry backwards
-        current_seq = 0
-        for date_str in reversed(sorted_dates):
-            if daily_log[date_str].get("sober", False):
-                current_seq += 1
-            else:
-                break
-
+        stats = self._compute_all()
         return {
-            "total_days": total_days,
-            "percent_sober": percent_sober,
-            "longest_streak": longest_streak,
-            "current_streak": current_seq
+            "total_days": stats.total_days,
+            "percent_sober": stats.percent_sober,
+            "longest_streak": stats.longest_streak,
+            "current_streak": stats.current_streak
         }
 
     def print_statistics(self) -> None:
         """
         Prints monthly, yearly, additional statistics, and spending information in a formatted manner.
         """
-        stats = self.get_statistics()
-        add_stats = self.get_additional_stats()
-        print("\n=== Monthly Statistics (Log) ===")
-        for month_key in sorted(stats["monthly"].keys()):
-            m_stat = stats["monthly"][month_key]
+        stats = self._compute_all()
+        # Build the whole block first and write it in one go
+        out = ["\n=== Monthly Statistics (Log) ==="]
+        for month_key, m_stat in stats.monthly.items():
             # Format month using the MONTH_NAMES constant
             try:
                 year, month = month_key.split("-")
@@ -158,39 +272,20 @@ class SobrietyTracker:
             except Exception:
                 formatted_month = month_key
             percent = (m_stat["sober_days"] / m_stat["total_days"] * 100) if m_stat["total_days"] else 0
-            print(f"{formatted_month}: {m_stat['sober_days']} sober days out of {m_stat['total_days']} days ({percent:.2f}%), spent: {m_stat['spent']:.2f} $")
+            out.append(f"{formatted_month}: {m_stat['sober_days']} sober days out of {m_stat['total_days']} days ({percent:.2f}%), spent: {m_stat['spent']:.2f} $")
 
-        print("\n=== Yearly Statistics (Log) ===")
-        for year_key in sorted(stats["yearly"].keys()):
-            y_stat = stats["yearly"][year_key]
+        out.append("\n=== Yearly Statistics (Log) ===")
+        for year_key, y_stat in stats.yearly.items():
             percent = (y_stat["sober_days"] / y_stat["total_days"] * 100) if y_stat["total_days"] else 0
-            print(f"{year_key}: {y_stat['sober_days']} sober days out of {y_stat['total_days']} days ({percent:.2f}%)")
-
-        print("\n=== Additional Statistics (Log) ===")
-        print(f"Total days in log: {add_stats['total_days']}")
-        print(f"Percentage sober: {add_stats['percent_sober']:.2f}%")
-        print(f"Longest sober streak: {add_stats['longest_streak']} days")
-        print(f"Current sober streak: {add_stats['current_streak']} days")
-
-        # Calculate spending details
-        overall_spending = 0.0
-        current_month_spending = 0.0
-        now = datetime.now()
-        for date_str, record in self.get_all_entries().items():
-            try:
-                d = datetime.strptime(date_str, "%Y-%m-%d")
-            except Exception:
-                continue
-            if not record.get("sober", False):
-                try:
-                    amt = float(record.get("amount_spent", DEFAULT_AMOUNT))
-                    if amt == 0:
-                        amt = DEFAULT_AMOUNT
-                except Exception:
-                    amt = DEFAULT_AMOUNT
-                overall_spending += amt
-                if d.year == now.year and d.month == now.month:
-                    current_month_spending += amt
-        print("\n=== Alcohol Spending (Log) ===")
-        print(f"Total amount spent on alcohol (overall): {overall_spending:.2f} $")
-        print(f"Total amount spent on alcohol (current month): {current_month_spending:.2f} $")
+            out.append(f"{year_key}: {y_stat['sober_days']} sober days out of {y_stat['total_days']} days ({percent:.2f}%)")
+
+        out.append("\n=== Additional Statistics (Log) ===")
+        out.append(f"Total days in log: {stats.total_days}")
+        out.append(f"Percentage sober: {stats.percent_sober:.2f}%")
+        out.append(f"Longest sober streak: {stats.longest_streak} days")
+        out.append(f"Current sober streak: {stats.current_streak} days")
+
+        out.append("\n=== Alcohol Spending (Log) ===")
+        out.append(f"Total amount spent on alcohol (overall): {stats.overall_spent:.2f} $")
+        out.append(f"Total amount spent on alcohol (current month): {stats.current_month_spent:.2f} $")
+        sys.stdout.write("\n".join(out) + "\n")
@@ -4,9 +4,10 @@ Handles the console-based user interface, including calendar display.
 """
 
 import calendar
+import sys
 from datetime import datetime
 from colorama import Fore, Back, Style
-from .data_manager import load_data
+from .constants import DEFAULT_AMOUNT
 
 def display_calendar(year: int, month: int, data: dict) -> None:
     """
@@ -21,68 +22,63 @@ def display_calendar(year: int, month: int, data: dict) -> None:
     
     week_header = ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]
     header_str = " ".join(f"{day:>3}" for day in week_header)
-    print(Fore.CYAN + f"\nCalendar for {month}/{year}")
-    print(Fore.WHITE + header_str)
+    lines = [Fore.CYAN + f"\nCalendar for {month}/{year}", Fore.WHITE + header_str]
     
-    daily_log = load_data().get("daily_log", {})
+    daily_log = data.get("daily_log", {})
     
     for week in cal:
-        week_str = ""
+        parts = []
         for day in week:
             if day == 0:
-                week_str += "    "
+                parts.append("    ")
             else:
                 date_str = f"{year}-{month:02d}-{day:02d}"
                 if date_str in daily_log:
                     record = daily_log[date_str]
-                    if record.get("sober", False):
-                        week_str += Back.GREEN + f"{day:3d}" + Style.RESET_ALL + " "
+                    if record["sober"]:
+                        parts.append(Back.GREEN + f"{day:3d}" + Style.RESET_ALL + " ")
                     else:
-                        week_str += Back.RED + f"{day:3d}" + Style.RESET_ALL + " "
+                        parts.append(Back.RED + f"{day:3d}" + Style.RESET_ALL + " ")
                 else:
-                    week_str += f"{day:3d} "
-        print(week_str)
+                    parts.append(f"{day:3d} ")
+        lines.append("".join(parts))
     
     total = 0
     sober = 0
     spent = 0.0
+    month_prefix = f"{year}-{month:02d}"
     for date_str, record in daily_log.items():
-        try:
-            d = datetime.strptime(date_str, "%Y-%m-%d")
-        except Exception:
-            continue
-        if d.year == year and d.month == month:
+        if date_str[:7] == month_prefix:
             total += 1
-            if record.get("sober", False):
+            if record["sober"]:
                 sober += 1
             else:
-                try:
-                    amt = float(record.get("amount_spent", 40))
-                except Exception:
-                    amt = 40.0
-                if amt == 0:
-                    amt = 40.0
-                spent += amt
+                spent += record["amount_spent"] or DEFAULT_AMOUNT
     if total > 0:
         percent = sober / total * 100
-        print(Fore.CYAN + f"\nStatistics for {month}/{year}:")
-        print(Fore.YELLOW + f"{sober} sober days out of {total} days ({percent:.2f}%), spent: {spent:.2f} $")
+        lines.append(Fore.CYAN + f"\nStatistics for {month}/{year}:")
+        lines.append(Fore.YELLOW + f"{sober} sober days out of {total} days ({percent:.2f}%), spent: {spent:.2f} $")
     else:
-        print(Fore.YELLOW + "\nNo data available for the selected month.")
+        lines.append(Fore.YELLOW + "\nNo data available for the selected month.")
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def display_current_calendar() -> None:
+def display_current_calendar(data: dict) -> None:
     """
     Displays the calendar for the current month.
+
+    Parameters:
+        data (dict): The loaded application data.
     """
-    data = load_data()
     now = datetime.now()
     display_calendar(now.year, now.month, data)
 
-def display_given_calendar() -> None:
+def display_given_calendar(data: dict) -> None:
     """
     Prompts the user for a year and month, then displays the corresponding calendar and statistics.
+
+    Parameters:
+        data (dict): The loaded application data.
     """
-    data = load_data()
     try:
         year = int(input(Fore.CYAN + "Enter year (e.g., 2025): ").strip())
         month = int(input(Fore.CYAN + "Enter month (1-12): ").strip())
@@ -2,17 +2,18 @@
 Main entry point for the Sobriety Tracking Application.
 """
 
+import atexit
 import os
+import sys
 # Suppress pygame support message
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
 
 import pygame
 import time
-from app.data_manager import load_data
-from app.tracker import SobrietyTracker
+from app.tracker import SobrietyTracker, compute_stats
 from app.ui import display_current_calendar, display_given_calendar
 from app.report import ExcelReport
-from app.constants import MONTH_NAMES, DEFAULT_AMOUNT
+from app.constants import MONTH_NAMES
 from colorama import Fore
 from datetime import datetime
 
@@ -34,11 +35,13 @@ def main_menu() -> None:
     """
     Main menu loop.
     """
-    data = load_data()
     tracker = SobrietyTracker()
+    # Save anything still pending if the app exits without a flush
+    atexit.register(tracker.flush)
+    data = tracker.data
     
     # Display current month's calendar on startup
-    display_current_calendar()
+    display_current_calendar(data)
     
     while True:
         print(Fore.CYAN + "\n--- Sobriety Tracking Application ---")
@@ -68,16 +71,19 @@ def main_menu() -> None:
                 amount_spent = 0.0
 
             tracker.log_entry(date_str, sober, mood, notes, alcohol_type, alcohol_amount, amount_spent)
+            tracker.flush()
             if sober:
                 reward_sober()
         elif choice == "2":
-            print(Fore.BLUE + "\n========= ALL STATISTICS =========")
-            stats = tracker.get_statistics()
-            
+            stats = compute_stats(tracker.get_all_entries())
+            blue, green, cyan = Fore.BLUE, Fore.GREEN, Fore.CYAN
+            magenta, yellow = Fore.MAGENTA, Fore.YELLOW
+            # Build the whole block first and write it in one go
+            out = [f"{blue}\n========= ALL STATISTICS ========="]
+
             # Monthly Statistics in GREEN
-            print(Fore.GREEN + "\n=== Monthly Statistics (Log) ===")
-            for month_key in sorted(stats["monthly"].keys()):
-                m_stat = stats["monthly"][month_key]
+            out.append(f"{green}\n=== Monthly Statistics (Log) ===")
+            for month_key, m_stat in stats.monthly.items():
                 try:
                     year_str, month_str = month_key.split("-")
                     month_name = MONTH_NAMES.get(month_str, month_str)
@@ -85,47 +91,27 @@ def main_menu() -> None:
                 except Exception:
                     formatted_month = month_key
                 percent = (m_stat["sober_days"] / m_stat["total_days"] * 100) if m_stat["total_days"] else 0
-                print(Fore.GREEN + f"{formatted_month}: {m_stat['sober_days']} sober days out of {m_stat['total_days']} days ({percent:.2f}%), spent: {m_stat['spent']:.2f} $")
-            
+                out.append(f"{green}{formatted_month}: {m_stat['sober_days']} sober days out of {m_stat['total_days']} days ({percent:.2f}%), spent: {m_stat['spent']:.2f} $")
+
             # Yearly Statistics in CYAN
-            print(Fore.CYAN + "\n=== Yearly Statistics (Log) ===")
-            for year_key in sorted(stats["yearly"].keys()):
-                y_stat = stats["yearly"][year_key]
+            out.append(f"{cyan}\n=== Yearly Statistics (Log) ===")
+            for year_key, y_stat in stats.yearly.items():
                 percent = (y_stat["sober_days"] / y_stat["total_days"] * 100) if y_stat["total_days"] else 0
-                print(Fore.CYAN + f"{year_key}: {y_stat['sober_days']} sober days out of {y_stat['total_days']} days ({percent:.2f}%)")
-            
+                out.append(f"{cyan}{year_key}: {y_stat['sober_days']} sober days out of {y_stat['total_days']} days ({percent:.2f}%)")
+
             # Additional Statistics in MAGENTA
-            add_stats = tracker.get_additional_stats()
-            print(Fore.MAGENTA + "\n=== Additional Statistics (Log) ===")
-            print(Fore.MAGENTA + f"Total days in log: {add_stats['total_days']}")
-            print(Fore.MAGENTA + f"Percentage sober: {add_stats['percent_sober']:.2f}%")
-            print(Fore.MAGENTA + f"Longest sober streak: {add_stats['longest_streak']} days")
-            print(Fore.MAGENTA + f"Current sober streak: {add_stats['current_streak']} days")
-            
+            out.append(f"{magenta}\n=== Additional Statistics (Log) ===")
+            out.append(f"{magenta}Total days in log: {stats.total_days}")
+            out.append(f"{magenta}Percentage sober: {stats.percent_sober:.2f}%")
+            out.append(f"{magenta}Longest sober streak: {stats.longest_streak} days")
+            out.append(f"{magenta}Current sober streak: {stats.current_streak} days")
+
             # Alcohol Spending in YELLOW
-            overall_spending = 0.0
-            current_month_spending = 0.0
-            now = datetime.now()
-            daily_log = tracker.get_all_entries()
-            for date_str, record in daily_log.items():
-                try:
-                    d = datetime.strptime(date_str, "%Y-%m-%d")
-                except Exception:
-                    continue
-                if not record.get("sober", False):
-                    try:
-                        amt = float(record.get("amount_spent", DEFAULT_AMOUNT))
-                        if amt == 0:
-                            amt = DEFAULT_AMOUNT
-                    except Exception:
-                        amt = DEFAULT_AMOUNT
-                    overall_spending += amt
-                    if d.year == now.year and d.month == now.month:
-                        current_month_spending += amt
-            print(Fore.YELLOW + "\n=== Alcohol Spending (Log) ===")
-            print(Fore.YELLOW + f"Total amount spent on alcohol (overall): {overall_spending:.2f} $")
-            print(Fore.YELLOW + f"Total amount spent on alcohol (current month): {current_month_spending:.2f} $")
-            print(Fore.BLUE + "==================================\n")
+            out.append(f"{yellow}\n=== Alcohol Spending (Log) ===")
+            out.append(f"{yellow}Total amount spent on alcohol (overall): {stats.overall_spent:.2f} $")
+            out.append(f"{yellow}Total amount spent on alcohol (current month): {stats.current_month_spent:.2f} $")
+            out.append(f"{blue}==================================\n")
+            sys.stdout.write("\n".join(out) + "\n")
         elif choice == "3":
             report = ExcelReport(data)
             now = datetime.now()
@@ -133,7 +119,7 @@ def main_menu() -> None:
             filename = f"report {month_name} {now.year}.xlsx"
             report.generate(filename)
         elif choice == "4":
-            display_given_calendar()
+            display_given_calendar(data)
         elif choice == "5":
             print(Fore.GREEN + "Goodbye!")
             break